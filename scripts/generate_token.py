@@ -7,43 +7,55 @@ Usage:
     python generate_token.py customer2 --name "Acme Corp"
 """
 import argparse
-import base64
+import functools
 import hashlib
 import hmac
 import json
 import time
 
+try:
+    # SIMD base64 codec (AVX2/SSSE3/NEON, selected at import); same API as base64
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+# base64url of the fixed header {"alg":"HS256","typ":"JWT"}
+HEADER_B64 = b'eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9'
+
+
+@functools.lru_cache(maxsize=8)
+def _hmac_template(secret: str) -> hmac.HMAC:
+    """Return a keyed HMAC-SHA256 object to copy for each signature."""
+    return hmac.new(secret.encode(), None, hashlib.sha256)
+
 
 def generate_jwt(customer_id: str, customer_name: str = None, secret: str = 'your-jwt-secret-change-me') -> str:
     """Generate a JWT token with customer information."""
     
-    # Header
-    header = {
-        'alg': 'HS256',
-        'typ': 'JWT'
-    }
+    now = int(time.time())
     
     # Payload
     payload = {
         'customer_id': customer_id,
         'customer_name': customer_name or customer_id,
         'sub': customer_id,
-        'iat': int(time.time()),
-        'exp': int(time.time()) + 3600,  # 1 hour expiry
+        'iat': now,
+        'exp': now + 3600,  # 1 hour expiry
         'iss': 'x-customer-id-demo'
     }
     
-    # Encode header and payload
-    header_b64 = base64.urlsafe_b64encode(json.dumps(header).encode()).rstrip(b'=').decode()
-    payload_b64 = base64.urlsafe_b64encode(json.dumps(payload).encode()).rstrip(b'=').decode()
+    # Encode payload (header is fixed, see HEADER_B64)
+    payload_b64 = base64.urlsafe_b64encode(
+        json.dumps(payload, separators=(',', ':')).encode()
+    ).rstrip(b'=')
     
-    # Create signature
-    message = f"{header_b64}.{payload_b64}".encode()
-    signature = base64.urlsafe_b64encode(
-        hmac.new(secret.encode(), message, hashlib.sha256).digest()
-    ).rstrip(b'=').decode()
+    # Create signature (everything stays bytes until the final decode)
+    message = HEADER_B64 + b'.' + payload_b64
+    mac = _hmac_template(secret).copy()
+    mac.update(message)
+    signature = base64.urlsafe_b64encode(mac.digest()).rstrip(b'=')
     
-    return f"{header_b64}.{payload_b64}.{signature}"
+    return (message + b'.' + signature).decode('ascii')
 
 
 def main():
@@ -68,7 +80,7 @@ def main():
     
     # Decode and show payload
     payload_b64 = token.split('.')[1]
-    payload_b64 += '=' * (4 - len(payload_b64) % 4)
+    payload_b64 += '=' * (-len(payload_b64) % 4)
     payload = json.loads(base64.urlsafe_b64decode(payload_b64))
     
     print(f"{'='*60}")
@@ -3,8 +3,31 @@ Backend Lambda - Simulates your upstream service.
 Demonstrates that X-Customer-ID header is received from API Gateway.
 """
 import json
+import os
 from typing import Any
 
+# The full event is only printed when LOG_LEVEL=DEBUG.
+_DEBUG = os.environ.get('LOG_LEVEL', 'INFO').upper() == 'DEBUG'
+
+# The response body has a fixed shape, so it is kept as a compact JSON
+# template; only the JSON-escaped request values are substituted.
+_RESPONSE_TEMPLATE = (
+    '{{"message":"Request successfully routed!",'
+    '"routing":{{"customerId":"{cid}","customerName":"{cname}",'
+    '"targetNamespace":"cust-{cid}",'  # Simulated K8s namespace
+    '"targetService":"{cid}-service.cust-{cid}.svc.cluster.local"}},'
+    '"request":{{"path":"{path}","method":"{method}","sourceIp":"{source_ip}"}},'
+    '"headers":{{"x-customer-id":"{cid}","x-customer-name":"{cname}",'
+    '"host":"{host}","user-agent":"{user_agent}"}},'
+    '"info":"In production, this request would be forwarded to your K8s ingress '
+    'which routes based on the X-Customer-ID header to the correct namespace."}}'
+)
+
+
+def _escape(value: str) -> str:
+    """Return value JSON-escaped, without the surrounding quotes."""
+    return json.dumps(value)[1:-1]
+
 
 def lambda_handler(event: dict, context: Any) -> dict:
     """
@@ -14,7 +37,8 @@ def lambda_handler(event: dict, context: Any) -> dict:
     In a real scenario, this would be your Private Link endpoint
     forwarding to Kubernetes ingress.
     """
-    print(f"Event: {json.dumps(event)}")
+    if _DEBUG:
+        print(f"Event: {json.dumps(event)}")
     
     # Extract headers (API Gateway v2 format)
     headers = event.get('headers', {})
@@ -32,28 +56,15 @@ def lambda_handler(event: dict, context: Any) -> dict:
     source_ip = http_info.get('sourceIp', 'unknown')
     
     # Build response showing the routing information
-    response_body = {
-        'message': 'Request successfully routed!',
-        'routing': {
-            'customerId': customer_id,
-            'customerName': customer_name,
-            'targetNamespace': f'cust-{customer_id}',  # Simulated K8s namespace
-            'targetService': f'{customer_id}-service.cust-{customer_id}.svc.cluster.local'
-        },
-        'request': {
-            'path': path,
-            'method': method,
-            'sourceIp': source_ip
-        },
-        'headers': {
-            'x-customer-id': customer_id,
-            'x-customer-name': customer_name,
-            'host': headers.get('host', 'unknown'),
-            'user-agent': headers.get('user-agent', 'unknown')
-        },
-        'info': 'In production, this request would be forwarded to your K8s ingress '
-                'which routes based on the X-Customer-ID header to the correct namespace.'
-    }
+    response_body = _RESPONSE_TEMPLATE.format(
+        cid=_escape(customer_id),
+        cname=_escape(customer_name),
+        path=_escape(path),
+        method=_escape(method),
+        source_ip=_escape(source_ip),
+        host=_escape(headers.get('host', 'unknown')),
+        user_agent=_escape(headers.get('user-agent', 'unknown'))
+    )
     
     return {
         'statusCode': 200,
@@ -62,5 +73,5 @@ def lambda_handler(event: dict, context: Any) -> dict:
             'X-Customer-ID': customer_id,  # Echo back for verification
             'X-Routed-To': f'cust-{customer_id}'
         },
-        'body': json.dumps(response_body, indent=2)
+        'body': response_body
     }